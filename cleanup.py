@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 import argparse
 import logging
+import os
 import sys
-import subprocess
 import textwrap
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from prompt_toolkit import prompt
@@ -12,7 +13,6 @@ from prompt_toolkit.validation import Validator, ValidationError
 
 # Set default values
 DEFAULT_DIRECTORY = Path.home()
-TEMP_FILE = DEFAULT_DIRECTORY / f".{Path(sys.argv[0]).name}.log"
 
 # Define color codes
 RED = "\033[31m"
@@ -25,6 +25,11 @@ RESET = "\033[0m"
 # Constants
 TERM_WIDTH = 80
 BOX_PADDING = 2
+BOX_BORDER = "─" * (TERM_WIDTH - 2)
+BOX_BLANK_LINE = f"│{' ' * (TERM_WIDTH - 2)}│"
+BOX_WRAPPER = textwrap.TextWrapper(width=TERM_WIDTH - BOX_PADDING * 2)
+DEFAULT_THREADS = min(32, (os.cpu_count() or 1) * 4)
+BACKUP_SUFFIXES = (".bak", ".swp", ".DS_Store", "~")
 
 
 class YNValidator(Validator):
@@ -99,10 +104,8 @@ def check_directory_arg(directory):
     global DEFAULT_DIRECTORY
     if not directory.is_dir():
         print_warning(f"{directory} is not a directory. Defaulting to {DEFAULT_DIRECTORY}")
-        check_os_and_set_find()
     else:
         DEFAULT_DIRECTORY = directory
-        check_os_and_set_find()
 
 
 def draw_box(*message_lines):
@@ -120,59 +123,54 @@ def draw_box(*message_lines):
     new_message_lines = []
     for line in message_lines:
         if len(line) > TERM_WIDTH - BOX_PADDING * 2:
-            new_message_lines.extend(textwrap.wrap(line, width=TERM_WIDTH - BOX_PADDING * 2))
+            new_message_lines.extend(BOX_WRAPPER.wrap(line))
         else:
             new_message_lines.append(line)
 
     # Draw the box
-    logger.info(f"{ORANGE}┌{'─' * (TERM_WIDTH - 2)}┐\n{'│':<79}{'│'}")
-    for i, line in enumerate(new_message_lines):
-        # Calculate padding for each line
-        line_length = len(line)
-        left_padding = (TERM_WIDTH - BOX_PADDING * 2 - line_length) // 2
-        right_padding = TERM_WIDTH - BOX_PADDING * 2 - left_padding - line_length
+    box_lines = [f"{ORANGE}┌{BOX_BORDER}┐", BOX_BLANK_LINE]
+    for line in new_message_lines:
+        box_lines.append(f"│{YELLOW}{f' {line} '.center(TERM_WIDTH - 2)}{ORANGE}│")
+    box_lines.append(BOX_BLANK_LINE)
+    box_lines.append(f"└{BOX_BORDER}┘{RESET}")
+    logger.info("\n".join(box_lines))
 
-        # Draw the line
-        logger.info(f"{'│':<}{YELLOW}{' ' * left_padding} {line} {' ' * right_padding}{ORANGE}{'│'}")
-    logger.info(f"{'│':<79}{'│'}\n{'└'}{'─' * (TERM_WIDTH - 2)}{'┘'}{RESET}")
 
-
-def check_os_and_set_find():
+def iter_targets(root):
     """
-    Check the operating system and set the find command accordingly.
+    Walk a directory tree and yield the paths of backup files.
 
-    Returns:
-        None
+    Args:
+        root (Path): The directory to walk.
+
+    Yields:
+        str: The path of each file whose name ends with one of BACKUP_SUFFIXES.
     """
-    logger.debug("Performing sanity check")
-    global agnostic_find
-    if sys.platform.startswith("linux"):
-        agnostic_find = ["find", str(DEFAULT_DIRECTORY), "-regextype", "posix-extended", "-regex"]
-    elif sys.platform.startswith("freebsd") or sys.platform.startswith("darwin"):
-        agnostic_find = ["find", "-E", str(DEFAULT_DIRECTORY), "-type", "f", "-regex"]
-
-    if TEMP_FILE.is_file():
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
         try:
-            TEMP_FILE.unlink()
-            draw_box(f"removing {TEMP_FILE}")
-        except Exception as e:
-            logging.exception(f"Failed to remove {TEMP_FILE}: {e}")
-            sys.exit(1)
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(BACKUP_SUFFIXES):
+                        yield entry.path
+        except OSError as e:
+            logger.debug(f"Skipping {directory}: {e}")
+
 
 def find_files():
     """
-    Find files that match the regex and write to temporary file.
+    Find backup files under DEFAULT_DIRECTORY and collect their paths.
 
     Returns:
         None
     """
     logger.debug("Finding files")
+    global paths
     try:
-        with TEMP_FILE.open("w") as f:
-            agnostic_find.append(r".*\.(bak|swp|DS_Store|~)$")
-            agnostic_find.append("-print")
-            result = subprocess.run(agnostic_find, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            f.write(result.stdout)
+        paths = list(iter_targets(DEFAULT_DIRECTORY))
     except Exception as e:
         logging.exception(f"Failed to find files: {e}")
         sys.exit(1)
@@ -185,13 +183,8 @@ def count_files():
         None
     """
     logger.debug("Counting files")
-    try:
-        with TEMP_FILE.open() as f:
-            global num_files
-            num_files = len(f.readlines())
-    except Exception as e:
-        logging.exception(f"Failed to count files: {e}")
-        sys.exit(1)
+    global num_files
+    num_files = len(paths)
 
 
 def display_box():
@@ -203,58 +196,67 @@ def display_box():
     """
     logger.debug("Displaying message box")
     try:
-        with TEMP_FILE.open() as f:
-            file_names = [line.strip() for line in f]
-            if num_files > 0:
-                message_lines = [f"{len(file_names)} files to be removed:"]
-                for name in file_names:
-                    message_lines.append(f"{name}")
-                draw_box(*message_lines)
-            else:
-                print_info("No files found to remove.")
+        if num_files > 0:
+            draw_box(f"{num_files} files to be removed:", *paths)
+        else:
+            print_info("No files found to remove.")
     except Exception as e:
         logging.exception(f"Failed to display message: {e}")
         sys.exit(1)
 
 
-def remove_files():
+def remove_files(threads=DEFAULT_THREADS):
     """
     Remove the files.
 
+    Args:
+        threads (int): The number of worker threads used to unlink files.
+
     Returns:
         None
     """
-    logger.debug("Removing files")
-    try:
-        with TEMP_FILE.open() as f:
-            for line in f:
-                line = line.strip()
-                print_warning(line)
-                Path(line).unlink()
-    except Exception as e:
-        logging.exception(f"Failed to remove files: {e}")
+    logger.debug(f"Removing files using {threads} threads")
+    failed = False
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = {executor.submit(os.unlink, path): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                future.result()
+                print_warning(path)
+            except Exception as e:
+                logging.exception(f"Failed to remove {path}: {e}")
+                failed = True
+    if failed:
         sys.exit(1)
 
 
-def clean_up():
+def positive_int(value):
     """
-    Clean up the temporary files.
+    Parse a command-line value as a positive integer.
+
+    Args:
+        value (str): The value passed on the command line.
 
     Returns:
-        None
+        int: The parsed value.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not an integer greater than zero.
     """
-    logger.debug("Cleaning up temporary files")
-    if TEMP_FILE.is_file():
-        try:
-            TEMP_FILE.unlink()
-        except Exception as e:
-            logging.exception(f"Failed to remove {TEMP_FILE}: {e}")
-            sys.exit(1)
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 # Parse command-line arguments
 parser = argparse.ArgumentParser(description="Clean up backup files.")
 parser.add_argument("directory", nargs="?", type=Path, default=DEFAULT_DIRECTORY, help="directory to clean up")
+parser.add_argument("--threads", type=positive_int, default=DEFAULT_THREADS, help="number of threads used to remove files")
 parser.add_argument("--debug", action="store_true", help="print debug information")
 args = parser.parse_args()
 
@@ -272,9 +274,7 @@ display_box()
 
 if num_files > 0:
     if prompt_yn("Are you sure you want to delete these files?"):
-        remove_files()
+        remove_files(args.threads)
         print_success("Cleanup complete.")
     else:
         print_info("Cleanup aborted.")
-
-clean_up()
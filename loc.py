@@ -1,13 +1,17 @@
 #!/usr/bin/env python
 import os
+import sys
+import multiprocessing
 import argparse
-from collections import defaultdict
+from array import array
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from rich.console import Console
 from rich.table import Table
 from rich import box
 from rich.style import Style
-from typing import Optional, List, Tuple, Dict
-import subprocess
+from typing import Optional, List, Tuple, Dict, Iterator
 
 console = Console()
 
@@ -63,10 +67,22 @@ FILENAME_MAPPING: Dict[str, str] = {
     'Dockerfile': 'Dockerfile',
 }
 
-BINARY_EXTENSIONS = {'.gz', '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.ico', '.tiff', '.webp', '.pdf', '.exe'}
+# Bytes that may appear in text files; anything else counts towards the binary ratio
+TEXT_BYTES = bytes({7, 8, 9, 10, 12, 13, 27}) + bytes(range(0x20, 0x100))
+
+BINARY_EXTENSIONS = frozenset({'.gz', '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.ico', '.tiff', '.webp', '.pdf', '.exe'})
 
 # Default directories to exclude
-DEFAULT_EXCLUDED_DIRS = {'build', '__pycache__', 'node_modules', 'dist', '.git', '.svn', '.env', '.venv', '.so', 'env', 'venv'}
+DEFAULT_EXCLUDED_DIRS = frozenset({'build', '__pycache__', 'node_modules', 'dist', '.git', '.hg', '.svn', '.env', '.venv', '.next', '.so', 'env', 'venv', 'target'})
+
+# Number of threads used to scan files
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Units used by _format_size, each 1024 times the previous one
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Per-file results as parallel columns; line counts and sizes are stored unboxed
+FileCounts = namedtuple('FileCounts', 'paths lines sizes languages')
 
 # Create styles using the custom theme
 header_style = Style.parse("bold #F6D365")
@@ -83,82 +99,128 @@ warning_style = Style.parse("bold #FFE58F")
 error_style = Style.parse("bold #FA5D5D")
 
 
-def detect_language(file_path: str) -> str:
-    """Detect the programming language of a file."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            first_line = file.readline().strip()
+def _classify(file_name: str, file_ext: str) -> Optional[str]:
+    """Resolve a language from a file name or lowercased extension, or None if neither is known."""
+    return FILENAME_MAPPING.get(file_name) or SUPPORTED_EXTENSIONS.get(file_ext)
 
-            if first_line.startswith('<?xml'):
-                return 'XML'
 
-            for line in file:
-                for char in line:
-                    if ord(char) < 32 and char not in ['\n', '\r', '\t']:
-                        return 'Binary'
+def is_binary_chunk(chunk: bytes) -> bool:
+    """Check if a block of bytes read from the start of a file looks binary."""
+    if b'\x00' in chunk:
+        return True
+    # Otherwise treat the block as binary when more than 30% of it is bytes outside TEXT_BYTES
+    return bool(chunk) and len(chunk.translate(None, TEXT_BYTES)) / len(chunk) > 0.3
 
-            return 'Text'
 
-    except FileNotFoundError:
-        console.print(f"[{error_style}]File not found: {file_path}[/{error_style}]")
-        return 'Unknown'
-    except UnicodeDecodeError:
-        return 'Binary'
-    except Exception as e:
-        console.print(f"[{error_style}]Error processing file {file_path}: {e}[/{error_style}]")
-        return 'Unknown'
+def scan_file(file_path: str) -> Tuple[bool, int, int, str]:
+    """Sniff, count lines and measure the size of a file in a single read pass.
 
+    Returns a tuple of (is_binary, lines, size, content_language). Reading stops after the
+    first block once a file is known to be binary.
+    """
+    with open(file_path, 'rb') as f:
+        chunk = f.read(1 << 16)
+        head = chunk[:8192]
+        if is_binary_chunk(head):
+            return True, 0, len(chunk), 'Binary'
 
-def is_binary_file(file_path: str) -> bool:
-    """Check if a file is binary."""
-    try:
-        result = subprocess.run(['file', '--mime', '-b', file_path], capture_output=True, text=True)
-        return 'binary' in result.stdout.lower()
-    except Exception as e:
-        console.print(f"[{error_style}]Error determining file type for {file_path}: {e}[/{error_style}]")
-        return False
+        # The binary check has already run on this block, so only the XML prefix is left to test
+        content_language = 'XML' if head.lstrip().startswith(b'<?xml') else 'Text'
+        lines = 0
+        size = 0
+        last = b'\n'
+        while chunk:
+            size += len(chunk)
+            lines += chunk.count(b'\n')
+            last = chunk[-1:]
+            chunk = f.read(1 << 16)
+
+    # A trailing line without a newline still counts, as it does when iterating a text file
+    if last != b'\n':
+        lines += 1
+    return False, lines, size, content_language
 
 
-def count_lines_and_size(start: str, exclude_filetypes: Optional[List[str]] = None, exclude_dirs: Optional[set] = None) -> Tuple[int, int, dict, dict]:
+def _scan_file_safe(file_path: str) -> Tuple[Optional[Tuple[bool, int, int, str]], Optional[str]]:
+    """Scan a file, returning the error message instead of raising."""
+    try:
+        return scan_file(file_path), None
+    except OSError as e:
+        return None, str(e)
+
+
+def _scan_tree(start: str, exclude_dirs: frozenset, exclude_exts: frozenset) -> Iterator[Tuple[os.DirEntry, str]]:
+    """Yield each regular file under a directory with its lowercased extension, pruning excluded entries."""
+    stack = [start]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in exclude_dirs:
+                            stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        # Leading dots never start an extension, matching os.path.splitext
+                        stem = entry.name.lstrip('.')
+                        dot = stem.rfind('.')
+                        file_ext = stem[dot:].lower() if dot > 0 else ''
+                        if file_ext in exclude_exts or file_ext in BINARY_EXTENSIONS:
+                            continue
+                        yield entry, file_ext
+        except OSError:
+            # Unreadable directories are skipped, as os.walk does by default
+            continue
+
+
+def count_lines_and_size(start: str, exclude_filetypes: Optional[List[str]] = None, exclude_dirs: Optional[frozenset] = None, processes: int = 0) -> Tuple[int, int, FileCounts, dict]:
     """Count lines of code and size in a directory."""
     total_lines = 0
     total_size = 0
-    file_counts = defaultdict(lambda: {'lines': 0, 'size': 0, 'language': 'Unknown'})
-    language_totals = defaultdict(lambda: {'lines': 0, 'size': 0})
+    file_counts = FileCounts([], array('q'), array('q'), [])
+    # Per-language [lines, size] pairs, kept as lists so they can be updated in place
+    language_totals: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
 
     exclude_dirs = exclude_dirs or DEFAULT_EXCLUDED_DIRS
+    exclude_exts = frozenset(ext.lower() for ext in exclude_filetypes or ())
+    candidates = []
 
     try:
-        for root, dirs, files in os.walk(start):
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-
-            for file in files:
-                file_path = os.path.join(root, file)
-                file_name = os.path.basename(file)
-                file_ext = os.path.splitext(file)[1]
+        # Unreadable files are not filtered here; opening them in scan_file reports the error instead
+        for entry, file_ext in _scan_tree(start, exclude_dirs, exclude_exts):
+            candidates.append((entry.path, _classify(entry.name, file_ext)))
+
+        # Files are independent. Reading them is mostly I/O bound, so a thread pool is the default;
+        # worker processes avoid the GIL when the tree is already in the page cache and scanning is CPU bound
+        paths = [file_path for file_path, _ in candidates]
+        if processes:
+            pool = multiprocessing.Pool(processes)
+            results = pool.imap(_scan_file_safe, paths, chunksize=256)
+        else:
+            pool = ThreadPoolExecutor(max_workers=DEFAULT_WORKERS)
+            results = pool.map(_scan_file_safe, paths)
 
-                if exclude_filetypes and file_ext in exclude_filetypes:
+        with pool:
+            for (file_path, language), (scan, error) in zip(candidates, results):
+                if error:
+                    console.print(f"[{error_style}]Error reading file {file_path}: {error}[/{error_style}]")
                     continue
 
-                if is_binary_file(file_path):
+                is_binary, new_lines, file_size, content_language = scan
+                if is_binary:
                     continue
 
-                try:
-                    if not os.path.isfile(file_path) or not os.access(file_path, os.R_OK):
-                        continue
-
-                    language = FILENAME_MAPPING.get(file_name, SUPPORTED_EXTENSIONS.get(file_ext, detect_language(file_path)))
-
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        new_lines = sum(1 for _ in f)
-                        file_size = os.path.getsize(file_path)
-                        total_lines += new_lines
-                        total_size += file_size
-                        file_counts[file_path] = {'lines': new_lines, 'size': file_size, 'language': language}
-                        language_totals[language]['lines'] += new_lines
-                        language_totals[language]['size'] += file_size
-                except (UnicodeDecodeError, OSError) as e:
-                    console.print(f"[{error_style}]Error reading file {file_path}: {e}[/{error_style}]")
+                # Contents are only consulted when the file name and extension are unknown
+                language = sys.intern(language or content_language)
+                total_lines += new_lines
+                total_size += file_size
+                file_counts.paths.append(file_path)
+                file_counts.lines.append(new_lines)
+                file_counts.sizes.append(file_size)
+                file_counts.languages.append(language)
+                totals = language_totals[language]
+                totals[0] += new_lines
+                totals[1] += file_size
 
     except KeyboardInterrupt:
         console.print("[{error_style}]Operation cancelled by user.[/{error_style}]")
@@ -166,7 +228,7 @@ def count_lines_and_size(start: str, exclude_filetypes: Optional[List[str]] = No
     return total_lines, total_size, file_counts, language_totals
 
 
-def display_results(total_lines: int, total_size: int, file_counts: dict, language_totals: dict, start_directory: str) -> None:
+def display_results(total_lines: int, total_size: int, file_counts: FileCounts, language_totals: dict, start_directory: str) -> None:
     """Display results using Rich tables."""
     file_table = Table(title="[bold]Lines of Code, Size and File Type[/bold]", box=box.ROUNDED)
     file_table.pad_edge = False
@@ -179,21 +241,11 @@ def display_results(total_lines: int, total_size: int, file_counts: dict, langua
     file_table.add_column("Size", justify="right", style=cell_styles[2])
     file_table.add_column("Language", justify="left", style=cell_styles[3])
 
-    # Sort file_counts by file path alphabetically
-    sorted_files = sorted(file_counts.items(), key=lambda item: item[0])
-
-    for file, info in sorted_files:
-        lines = info['lines']
-        size = info['size']
-        language = info['language']
-
-        if file.startswith(start_directory):
-            file_display = '.' + file[len(start_directory):]
-        else:
-            file_display = file
-
-        file_size_human_readable = _format_size(size)
-        file_table.add_row(file_display, str(lines), file_size_human_readable, language)
+    # Sort file_counts by file path alphabetically; paths are unique, so ties never reach the other columns
+    prefix_length = len(start_directory)
+    for file, lines, size, language in sorted(zip(*file_counts)):
+        file_display = '.' + file[prefix_length:] if file.startswith(start_directory) else file
+        file_table.add_row(file_display, str(lines), _format_size(size), language)
 
     console.print(file_table)
 
@@ -207,18 +259,16 @@ def display_results(total_lines: int, total_size: int, file_counts: dict, langua
     language_table.add_column("Total Lines", justify="right", style=cell_styles[1])
     language_table.add_column("Total Size", justify="right", style=cell_styles[2])
 
-    for language, info in sorted(language_totals.items(), key=lambda item: item[1]['lines'], reverse=True):
-        lines = info['lines']
-        size = info['size']
-
-        size_human_readable = _format_size(size)
-        language_table.add_row(language, str(lines), size_human_readable)
+    language_rows = [(language, lines, size) for language, (lines, size) in language_totals.items()]
+    language_rows.sort(key=itemgetter(1), reverse=True)
+    for language, lines, size in language_rows:
+        language_table.add_row(language, str(lines), _format_size(size))
 
     console.print(language_table)
     console.print(f"\n[bold {warning_style}]Total Lines: {total_lines}, Total Size: {_format_size(total_size)}[/bold {warning_style}]")
 
     # Additional Metrics
-    total_files = len(file_counts)
+    total_files = len(file_counts.paths)
     average_lines = total_lines / total_files if total_files > 0 else 0
     average_size = total_size / total_files if total_files > 0 else 0
 
@@ -235,25 +285,33 @@ def _format_size(size_in_bytes: float) -> str:
     if size_in_bytes == 0:
         return "0 bytes"
 
-    # lets calculate the number of bytes into kilobytes, megabytes etc.
-    units = ['B', 'KB', 'MB', 'GB', 'TB']
-    unit_index = 0
+    # Each unit is 2**10 times the previous one, so the bit length of the size picks the unit directly
+    unit_index = min(max(int(size_in_bytes).bit_length() - 1, 0) // 10, len(SIZE_UNITS) - 1)
+
+    return f"{size_in_bytes / (1 << (unit_index * 10)):.2f} {SIZE_UNITS[unit_index]}"
 
-    while size_in_bytes >= 1024 and unit_index < len(units) - 1:
-        size_in_bytes /= 1024
-        unit_index += 1
 
-    return f"{size_in_bytes:.2f} {units[unit_index]}"
+def _non_negative_int(value: str) -> int:
+    """Parse a command-line value as an integer of zero or more."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {number}")
+    return number
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Count lines of code in a directory.")
     parser.add_argument("directory", nargs="?", default=os.getcwd(), help="Directory path to count lines of code.")
     parser.add_argument("-e", "--exclude", nargs="*", help="File extensions to exclude.")
     parser.add_argument("-d", "--exclude-dirs", nargs="*", help="Directories to exclude.")
+    parser.add_argument("-p", "--processes", type=_non_negative_int, default=0, help="Scan files with this many worker processes instead of threads (0 uses threads).")
     args = parser.parse_args()
 
     exclude_filetypes = args.exclude if args.exclude else []
-    exclude_dirs = set(args.exclude_dirs) if args.exclude_dirs else DEFAULT_EXCLUDED_DIRS
+    exclude_dirs = frozenset(args.exclude_dirs) if args.exclude_dirs else DEFAULT_EXCLUDED_DIRS
 
-    total_lines, total_size, file_counts, language_totals = count_lines_and_size(args.directory, exclude_filetypes, exclude_dirs)
+    total_lines, total_size, file_counts, language_totals = count_lines_and_size(args.directory, exclude_filetypes, exclude_dirs, args.processes)
     display_results(total_lines, total_size, file_counts, language_totals, os.path.abspath(args.directory))